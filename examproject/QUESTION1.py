@@ -127,3 +127,89 @@ def social_welfare(params):
     SWF = U - par.kappa * y2
 
     return -SWF
+
+def _cell_corners(cell):
+    i0, i1, j0, j1 = cell
+    return [(i0, j0), (i0, j1), (i1, j0), (i1, j1)]
+
+def _split_cell(cell):
+    i0, i1, j0, j1 = cell
+    i_cuts = [i0, (i0 + i1) // 2, i1] if i1 - i0 > 1 else [i0, i1]
+    j_cuts = [j0, (j0 + j1) // 2, j1] if j1 - j0 > 1 else [j0, j1]
+    return [(i_cuts[a], i_cuts[a + 1], j_cuts[b], j_cuts[b + 1])
+            for a in range(len(i_cuts) - 1) for b in range(len(j_cuts) - 1)]
+
+# Adaptive alternative to brute-forcing the full (tau, T) grid: start from every coarse_step-th grid point and
+# only split the cells that touch the current optimum, could hide a lower value (corner minimum minus half the
+# corner spread is below the optimum) or straddle the infeasible region where social_welfare returns np.inf.
+# Every grid point is solved at most once and kept in an array aligned with the dense grid (np.nan = not solved).
+# The corner extrapolation is a heuristic, so the optimum is exact only up to the local grid spacing around it
+# (tau_err, T_err). SWF_err is the largest welfare difference between the optimum and its solved neighbours within
+# that spacing, an estimate of how much the welfare can change when moving one grid step from the optimum.
+def adaptive_social_welfare_search(tau_values, T_values, coarse_step=8, objective=social_welfare):
+    tau_values = np.asarray(tau_values)
+    T_values = np.asarray(T_values)
+    n_T, n_tau = len(T_values), len(tau_values)
+    if n_T < 2 or n_tau < 2:
+        raise ValueError(f"The grid needs at least two values of tau and T, got {n_tau} and {n_T}")
+    store = np.full((n_T, n_tau), np.nan)
+    n_solves = 0
+
+    def evaluate(i, j):
+        nonlocal n_solves
+        if np.isnan(store[i, j]):
+            value = objective([tau_values[j], T_values[i]])
+            store[i, j] = np.inf if np.isnan(value) else value
+            n_solves += 1
+        return store[i, j]
+
+    i_coarse = np.unique(np.r_[np.arange(0, n_T, coarse_step), n_T - 1])
+    j_coarse = np.unique(np.r_[np.arange(0, n_tau, coarse_step), n_tau - 1])
+    cells = [(i_coarse[a], i_coarse[a + 1], j_coarse[b], j_coarse[b + 1])
+             for a in range(len(i_coarse) - 1) for b in range(len(j_coarse) - 1)]
+    for cell in cells:
+        for i, j in _cell_corners(cell):
+            evaluate(i, j)
+
+    while True:
+        i_best, j_best = np.unravel_index(np.nanargmin(store), store.shape)
+        best = store[i_best, j_best]
+        corner_values = np.array([[store[i, j] for i, j in _cell_corners(cell)] for cell in cells])
+        feasible = np.isfinite(corner_values)
+        at_best = np.array([i0 <= i_best <= i1 and j0 <= j_best <= j1 for i0, i1, j0, j1 in cells])
+        lower_bound = np.full(len(cells), np.inf)
+        interior = feasible.all(axis=1)
+        lower_bound[interior] = 1.5 * corner_values[interior].min(axis=1) - 0.5 * corner_values[interior].max(axis=1)
+        boundary = feasible.any(axis=1) & ~feasible.all(axis=1)
+
+        refine = at_best | (lower_bound < best) | boundary
+        splittable = np.array([i1 - i0 > 1 or j1 - j0 > 1 for i0, i1, j0, j1 in cells])
+        refine &= splittable
+        if not refine.any():
+            break
+
+        new_cells = []
+        for cell, flag in zip(cells, refine):
+            if not flag:
+                new_cells.append(cell)
+                continue
+            for child in _split_cell(cell):
+                for i, j in _cell_corners(child):
+                    evaluate(i, j)
+                new_cells.append(child)
+        cells = new_cells
+
+    if not np.isfinite(best):
+        raise ValueError(f"social_welfare is infeasible (np.inf) at all {n_solves} solved grid points")
+
+    results = SimpleNamespace()
+    results.tau = tau_values[j_best]
+    results.T = T_values[i_best]
+    results.SWF = -best
+    results.tau_err = np.abs(np.diff(tau_values)[max(j_best - 1, 0):j_best + 1]).max()
+    results.T_err = np.abs(np.diff(T_values)[max(i_best - 1, 0):i_best + 1]).max()
+    neighbours = store[max(i_best - 1, 0):i_best + 2, max(j_best - 1, 0):j_best + 2]
+    results.SWF_err = np.max(neighbours[np.isfinite(neighbours)] - best)
+    results.n_solves = n_solves
+    results.values = store
+    return results
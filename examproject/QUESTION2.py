@@ -1,4 +1,6 @@
 import numpy as np
+import os
+import itertools
 import matplotlib.pyplot as plt
 from types import SimpleNamespace
 
@@ -172,3 +174,117 @@ def main():
     new_average_subjective_utility, new_average_realised_utility, switch_share = calculate_new_results(par, chosen_careers, decisions_to_switch, new_expectations_before, new_realised_utilities)
     
     plot_new_results(par, switch_share, new_average_subjective_utility, new_average_realised_utility)
+
+# Common random numbers for parameter sweeps: standard normal shocks are drawn once (and optionally cached on
+# disk) and rescaled by sigma for every parameter setting, so differences between settings are not driven by
+# fresh Monte Carlo noise. F_max is the largest number of friends any setting in the sweep may use. The friend
+# shocks are drawn last and friend by friend, (F_max, N, K, J), so a larger F_max only appends new friends and
+# keeps all existing draws for the same seed.
+def draw_standard_shocks(par, F_max, seed=42, filename=None):
+    shocks = None
+    if filename is not None and os.path.exists(filename):
+        with np.load(filename) as cached:
+            friends = cached['friends']
+            if int(cached['seed']) == seed and friends.shape[1:] == (par.N, par.K, par.J) and friends.shape[0] >= F_max:
+                shocks = SimpleNamespace(friends=friends, own=cached['own'], switch=cached['switch'])
+
+    if shocks is None:
+        rng = np.random.default_rng(seed)
+        shocks = SimpleNamespace()
+        shocks.own = rng.standard_normal((par.N, par.K, par.J))
+        shocks.switch = rng.standard_normal((par.N, par.K))
+        shocks.friends = rng.standard_normal((F_max, par.N, par.K, par.J))
+        if filename is not None:
+            np.savez(filename, seed=seed, friends=shocks.friends, own=shocks.own, switch=shocks.switch)
+
+    # Running means over friends, so a graduate with F friends uses the first F draws of the block
+    F_block = shocks.friends.shape[0]
+    shocks.friends_mean = np.cumsum(shocks.friends, axis=0) / np.arange(1, F_block + 1)[:, None, None, None]
+    return shocks
+
+# Each keyword is a list of options to sweep over, all other parameters are taken from par: sigma and c are
+# scalars, v is an array of length J, and F is either a scalar (every graduate has that many friends) or an
+# array of length N, with at least one friend per graduate. The grid is the Cartesian product of all options.
+def make_parameter_grid(par, **values):
+    names = ['sigma', 'c', 'v', 'F']
+    for name in values:
+        if name not in names:
+            raise ValueError(f"Cannot sweep over '{name}', choose from {names}")
+
+    options = {name: [np.asarray(option) for option in values.get(name, [getattr(par, name)])] for name in names}
+    for name in names:
+        if len(options[name]) == 0:
+            raise ValueError(f"The list of {name} options must not be empty")
+    for name in ['sigma', 'c']:
+        for option in options[name]:
+            if option.ndim != 0:
+                raise ValueError(f"Each {name} option must be a scalar, got shape {option.shape}")
+    for option in options['v']:
+        if option.shape != (par.J,):
+            raise ValueError(f"Each v option must have length J = {par.J}, got shape {option.shape}")
+    for option in options['F']:
+        if option.shape not in [(), (par.N,)]:
+            raise ValueError(f"Each F option must be a scalar or have length N = {par.N}, got shape {option.shape}")
+        if not np.issubdtype(option.dtype, np.integer) or np.any(option < 1):
+            raise ValueError(f"F must be integers of at least 1, got {option}")
+
+    settings = list(itertools.product(*options.values()))
+
+    grid = SimpleNamespace()
+    grid.P = len(settings)
+    grid.sigma = np.array([setting[0] for setting in settings], dtype=float)
+    grid.c = np.array([setting[1] for setting in settings], dtype=float)
+    grid.v = np.array([setting[2] for setting in settings], dtype=float)
+    grid.F = np.array([np.broadcast_to(setting[3], (par.N,)) for setting in settings], dtype=int)
+    return grid
+
+# Every setting holds several (N, K, J) float64 arrays at once, about 15 MB per setting at the default N, K and J,
+# so memory grows linearly with grid.P. With chunk_size the grid is evaluated chunk_size settings at a time.
+def sweep_career_choice(par, grid, shocks, chunk_size=None):
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    if chunk_size is not None and chunk_size < grid.P:
+        chunks = []
+        for start in range(0, grid.P, chunk_size):
+            stop = min(start + chunk_size, grid.P)
+            grid_chunk = SimpleNamespace(P=stop - start, sigma=grid.sigma[start:stop], c=grid.c[start:stop],
+                                         v=grid.v[start:stop], F=grid.F[start:stop])
+            chunks.append(sweep_career_choice(par, grid_chunk, shocks))
+        return SimpleNamespace(**{name: np.concatenate([vars(chunk)[name] for chunk in chunks])
+                                  for name in vars(chunks[0])})
+
+    if grid.F.max() > shocks.friends.shape[0]:
+        raise ValueError(f"The shock block holds {shocks.friends.shape[0]} friends, but the grid needs {grid.F.max()}")
+
+    sigma = grid.sigma[:, None, None]
+    c = grid.c[:, None, None]
+    v = grid.v[:, None, None, :]
+    careers = np.arange(par.J)
+
+    # Question 2: pick the career with the highest prior expectation, shapes are (P, N, K, J) or (P, N, K)
+    friends_mean = shocks.friends_mean[grid.F - 1, np.arange(par.N)[None, :]]
+    expected_utility_before = v + sigma[..., None] * friends_mean
+    chosen_careers = np.argmax(expected_utility_before, axis=3)
+    expectations_before = np.take_along_axis(expected_utility_before, chosen_careers[..., None], axis=3)[..., 0]
+    own_shock = np.take_along_axis(shocks.own[None], chosen_careers[..., None], axis=3)[..., 0]
+    realised_utilities = np.take_along_axis(grid.v, chosen_careers.reshape(grid.P, -1), axis=1).reshape(chosen_careers.shape)
+    realised_utilities = realised_utilities + sigma * own_shock
+
+    # Question 3: reconsider after one year, paying c to switch
+    new_expected_utility_before = np.where(careers == chosen_careers[..., None],
+                                           realised_utilities[..., None], (expectations_before - c)[..., None])
+    new_chosen_careers = np.argmax(new_expected_utility_before, axis=3)
+    decisions_to_switch = new_chosen_careers != chosen_careers
+    new_expectations_before = np.take_along_axis(new_expected_utility_before, new_chosen_careers[..., None], axis=3)[..., 0]
+    new_v = np.take_along_axis(grid.v, new_chosen_careers.reshape(grid.P, -1), axis=1).reshape(new_chosen_careers.shape)
+    new_realised_utilities = np.where(decisions_to_switch, new_v + sigma * shocks.switch - c, realised_utilities)
+
+    chosen = chosen_careers[..., None] == careers
+    results = SimpleNamespace()
+    results.career_share = np.mean(chosen, axis=2)
+    results.average_subjective_utility = np.mean(expectations_before, axis=2)
+    results.average_realised_utility = np.mean(realised_utilities, axis=2)
+    results.switch_share = np.mean(decisions_to_switch[..., None] & chosen, axis=2)
+    results.new_average_subjective_utility = np.mean(new_expectations_before, axis=2)
+    results.new_average_realised_utility = np.mean(new_realised_utilities, axis=2)
+    return results